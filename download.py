@@ -2,18 +2,30 @@
 """Download crossword pages from xwordinfo.com for the past 30 days."""
 
 import argparse
+import gzip
 import os
+import threading
 import time
-import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 BASE_URL = "https://www.xwordinfo.com/Crossword"
 DAYS_BACK = 5 * 365
-DELAY_MIN = 1.0
-DELAY_MAX = 1.5
+MAX_WORKERS = 4
+MAX_REQUESTS_PER_SEC = 2
+WRITE_BUFFER = 64 * 1024
+GZIP_LEVEL = 6
+
+# Transient failures are retried with exponential backoff (0.5s, 1s, 2s);
+# every attempt goes back through the rate limiter
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 HEADERS = {
     "User-Agent": (
@@ -23,15 +35,72 @@ HEADERS = {
     )
 }
 
+# One keep-alive session for every fetch so the TLS handshake is paid once
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+
+
+class RateLimiter:
+    """Sliding-window limiter shared by the download threads."""
+
+    def __init__(self, max_calls, period=1.0):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until another request fits inside the window."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= self.period:
+                    self.calls.popleft()
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return
+                delay = self.period - (now - self.calls[0])
+            time.sleep(delay)
+
+
+RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_SEC)
+
+
+def fetch_one(day):
+    """Fetch the xwordinfo page for a date and return its HTML."""
+    # Format date as M/D/YYYY for the URL
+    url_date = f"{day.month}/{day.day}/{day.year}"
+    url = f"{BASE_URL}?date={url_date}"
+
+    for attempt in range(MAX_RETRIES + 1):
+        RATE_LIMITER.wait()
+        try:
+            resp = SESSION.get(url, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                resp.raise_for_status()
+                return resp.text
+        time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+def save_page(filepath, text):
+    """Write a page to the HTML cache, gzip-compressed."""
+    with open(filepath, "wb", buffering=WRITE_BUFFER) as f:
+        f.write(gzip.compress(text.encode("utf-8"), compresslevel=GZIP_LEVEL))
+
 
 def download_single(date_str):
     """Download a single date's HTML. date_str should be YYYY-MM-DD."""
     os.makedirs(DATA_DIR, exist_ok=True)
 
-    filename = f"{date_str}.html"
-    filepath = os.path.join(DATA_DIR, filename)
+    filepath = os.path.join(DATA_DIR, f"{date_str}.html.gz")
 
-    if os.path.exists(filepath):
+    # Pages cached before compression was added are plain .html
+    if os.path.exists(filepath) or os.path.exists(os.path.join(DATA_DIR, f"{date_str}.html")):
         print(f"[{date_str}] Already exists, skipping")
         return
 
@@ -41,13 +110,10 @@ def download_single(date_str):
 
     print(f"[{date_str}] Fetching {url} ... ", end="", flush=True)
 
-    resp = requests.get(url, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(resp.text)
+    text = fetch_one(d)
+    save_page(filepath, text)
 
-    print(f"OK ({len(resp.text):,} bytes)")
+    print(f"OK ({len(text):,} bytes)")
 
 
 def main():
@@ -71,42 +137,46 @@ def main():
     current = start_date
     downloaded = 0
     skipped = 0
+    pending = []
+
+    # One directory listing instead of a stat per day
+    existing = {entry.name for entry in os.scandir(DATA_DIR)}
 
     while current <= end_date:
         filename = f"{current.isoformat()}.html"
-        filepath = os.path.join(DATA_DIR, filename)
 
-        if os.path.exists(filepath):
+        # Pages cached before compression was added are plain .html
+        if f"{filename}.gz" in existing or filename in existing:
             print(f"  [{current}] Already exists, skipping")
             skipped += 1
-            current += timedelta(days=1)
-            continue
+        else:
+            pending.append(current)
 
-        # Format date as M/D/YYYY for the URL
-        url_date = f"{current.month}/{current.day}/{current.year}"
-        url = f"{BASE_URL}?date={url_date}"
+        current += timedelta(days=1)
 
-        print(f"  [{current}] Fetching {url} ... ", end="", flush=True)
+    print(f"Fetching {len(pending)} pages with {MAX_WORKERS} workers\n")
 
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
-            resp.raise_for_status()
+    pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        futures = {pool.submit(fetch_one, day): day for day in pending}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                text = future.result()
+            except requests.RequestException as e:
+                print(f"  [{day}] FAILED: {e}")
+                continue
 
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(resp.text)
+            save_page(os.path.join(DATA_DIR, f"{day.isoformat()}.html.gz"), text)
 
-            print(f"OK ({len(resp.text):,} bytes)")
+            print(f"  [{day}] OK ({len(text):,} bytes)")
             downloaded += 1
-
-        except requests.RequestException as e:
-            print(f"FAILED: {e}")
-
-        current += timedelta(days=1)
-
-        # Rate limit between requests
-        if current <= end_date:
-            delay = random.uniform(DELAY_MIN, DELAY_MAX)
-            time.sleep(delay)
+    except KeyboardInterrupt:
+        # Drop the queued dates; only the requests already in flight finish
+        print(f"\nInterrupted: {downloaded} downloaded, {skipped} skipped")
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
 
     print(f"\nDone: {downloaded} downloaded, {skipped} skipped")
 
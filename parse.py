@@ -6,24 +6,50 @@ and clue divs present in xwordinfo pages.
 """
 
 import argparse
+import gzip
 import json
 import os
 import re
+import sqlite3
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
 
+import orjson
 from bs4 import BeautifulSoup
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
-PUZZLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzles")
+PUZZLES_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzles.sqlite")
+WRITE_BUFFER = 64 * 1024
+COMMIT_EVERY = 100  # parsed puzzles per store transaction in bulk mode
+
+# Patterns used once per cell / clue, compiled up front
+_SHADE_COLOR = re.compile(r"background-color:\s*(#[0-9a-fA-F]{3,6})")
+_FINDER_LINK = re.compile(r"/Finder\?w=")
+_FINDER_HREF = re.compile(r"/Finder\?w=(\w+)")
+_TRAIL_COLON = re.compile(r"\s*:\s*$")
+
+
+def date_of(filepath: str) -> str:
+    """Puzzle date (YYYY-MM-DD) from a cached page's file name."""
+    return os.path.basename(filepath).split(".", 1)[0]
+
+
+def find_html_files() -> list[str]:
+    """Cached pages in DATA_DIR sorted by date, preferring .html.gz over .html."""
+    by_date = {}
+    for filepath in glob(os.path.join(DATA_DIR, "*.html")) + glob(os.path.join(DATA_DIR, "*.html.gz")):
+        by_date[date_of(filepath)] = filepath
+    return [by_date[d] for d in sorted(by_date)]
 
 
 def parse_file(filepath: str) -> dict | None:
-    """Parse a single xwordinfo HTML file into puzzle JSON."""
-    with open(filepath, "r", encoding="utf-8") as f:
+    """Parse a single xwordinfo HTML file (optionally gzipped) into puzzle JSON."""
+    opener = gzip.open if filepath.endswith(".gz") else open
+    with opener(filepath, "rt", encoding="utf-8") as f:
         html = f.read()
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
 
     # ── Metadata from JSON-LD ──────────────────────────────────────
     author = ""
@@ -37,16 +63,19 @@ def parse_file(filepath: str) -> dict | None:
         except (json.JSONDecodeError, AttributeError):
             pass
 
-    # Fallback metadata from aegrid div
-    if not author:
+    # Fallback metadata from aegrid div, only for fields JSON-LD didn't supply
+    if not author or not editor:
         aegrid = soup.find("div", id="CPHContent_AEGrid")
         if aegrid:
             divs = aegrid.find_all("div")
-            for i, d in enumerate(divs):
-                if d.get_text(strip=True) == "Author:" and i + 1 < len(divs):
+            for i, d in enumerate(divs[:-1]):
+                text = d.get_text(strip=True)
+                if text == "Author:" and not author:
                     author = divs[i + 1].get_text(strip=True)
-                if d.get_text(strip=True) == "Editor:" and i + 1 < len(divs):
+                elif text == "Editor:" and not editor:
                     editor = divs[i + 1].get_text(strip=True)
+                if author and editor:
+                    break
 
     # ── Grid from PuzTable ─────────────────────────────────────────
     table = soup.find("table", id="PuzTable")
@@ -58,31 +87,42 @@ def parse_file(filepath: str) -> dict | None:
     circles = []   # list of [row, col]
     shades = []    # list of [row, col, color]
     rebus = {}     # "row,col" → full rebus string (e.g. "TEN")
+    num_pos = {}   # clue number → (row, col), filled while walking the grid
 
     row_idx = 0
     for tr in table.find_all("tr"):
         row_letters = []
         row_nums = []
-        col_idx = 0
-        for td in tr.find_all("td"):
+        letters_append = row_letters.append
+        nums_append = row_nums.append
+        # Cells are direct children of the row; no need to search inside them
+        for col_idx, td in enumerate(tr.find_all("td", recursive=False)):
             classes = td.get("class") or []
+            style = td.get("style") or ""
             is_black = "black" in classes
             is_shade = "shade" in classes
             is_circle = "bigcircle" in classes
 
             # Only treat as black if it has "black" class, or has a background
             # style that isn't from shade styling
-            if not is_black and not is_shade and td.get("style") and "background" in td.get("style", ""):
+            if not is_black and not is_shade and "background" in style:
                 is_black = True
 
             if is_black:
-                row_letters.append(".")
-                row_nums.append(0)
+                letters_append(".")
+                nums_append(0)
             else:
-                letter_div = td.find("div", class_="letter")
+                # Collect the cell's divs by class in one walk (first one wins,
+                # matching what td.find would return)
+                cell_divs = {}
+                for div in td.find_all("div"):
+                    for cls in div.get("class") or ():
+                        cell_divs.setdefault(cls, div)
+
+                letter_div = cell_divs.get("letter")
                 # Rebus cells use 'subst' or 'subst2' class instead of 'letter'
-                subst_div = td.find("div", class_="subst") or td.find("div", class_="subst2")
-                num_div = td.find("div", class_="num")
+                subst_div = cell_divs.get("subst") or cell_divs.get("subst2")
+                num_div = cell_divs.get("num")
                 num_text = num_div.get_text(strip=True) if num_div else ""
 
                 if subst_div:
@@ -93,8 +133,11 @@ def parse_file(filepath: str) -> dict | None:
                 else:
                     letter = letter_div.get_text(strip=True) if letter_div else ""
 
-                row_letters.append(letter if letter else ".")
-                row_nums.append(int(num_text) if num_text else 0)
+                letters_append(letter if letter else ".")
+                num = int(num_text) if num_text else 0
+                nums_append(num)
+                if num > 0:
+                    num_pos[num] = (row_idx, col_idx)
 
                 if is_circle:
                     circles.append([row_idx, col_idx])
@@ -102,14 +145,11 @@ def parse_file(filepath: str) -> dict | None:
                 if is_shade:
                     # Extract shade color from inline style if present
                     shade_color = "#c0c0c0"  # default grey
-                    style = td.get("style", "")
-                    color_match = re.search(r"background-color:\s*(#[0-9a-fA-F]{3,6})", style)
+                    color_match = _SHADE_COLOR.search(style)
                     if color_match:
                         shade_color = color_match.group(1)
                     shades.append([row_idx, col_idx, shade_color])
 
-            col_idx += 1
-
         if row_letters:
             grid.append(row_letters)
             cell_numbers.append(row_nums)
@@ -144,9 +184,9 @@ def parse_file(filepath: str) -> dict | None:
 
             # Extract answer from Finder link, then remove it from the div
             answer = ""
-            link = clue_div.find("a", href=re.compile(r"/Finder\?w="))
+            link = clue_div.find("a", href=_FINDER_LINK)
             if link:
-                m = re.search(r"/Finder\?w=(\w+)", link.get("href", ""))
+                m = _FINDER_HREF.search(link.get("href", ""))
                 if m:
                     answer = m.group(1).upper()
                 link.decompose()  # remove the link so it doesn't appear in clue text
@@ -154,7 +194,7 @@ def parse_file(filepath: str) -> dict | None:
             # Get clue text (answer link already removed)
             clue_text = clue_div.get_text(strip=True)
             # Strip trailing " :" left after removing the answer link
-            clue_text = re.sub(r"\s*:\s*$", "", clue_text)
+            clue_text = _TRAIL_COLON.sub("", clue_text)
 
             clues.append({"number": num, "clue": clue_text, "answer": answer})
 
@@ -167,12 +207,6 @@ def parse_file(filepath: str) -> dict | None:
         return None
 
     # ── Map clue numbers to grid positions ─────────────────────────
-    num_pos = {}
-    for r in range(rows):
-        for c in range(cols):
-            if cell_numbers[r][c] > 0:
-                num_pos[cell_numbers[r][c]] = (r, c)
-
     for clue in across_clues:
         if clue["number"] in num_pos:
             clue["row"], clue["col"] = num_pos[clue["number"]]
@@ -182,8 +216,7 @@ def parse_file(filepath: str) -> dict | None:
             clue["row"], clue["col"] = num_pos[clue["number"]]
 
     # ── Extract date from filename ─────────────────────────────────
-    basename = os.path.basename(filepath)
-    date_str = basename.replace(".html", "")
+    date_str = date_of(filepath)
 
     # ── Day of week from title ─────────────────────────────────────
     title_el = soup.find("h1", id="PuzTitle")
@@ -214,15 +247,49 @@ def parse_file(filepath: str) -> dict | None:
     return result
 
 
+def open_puzzle_db(path: str = PUZZLES_DB) -> sqlite3.Connection:
+    """Open the SQLite store of parsed puzzles, creating it if needed.
+
+    Each row keeps the compact puzzle JSON and the mtime of the HTML it was
+    parsed from, which is what bulk mode checks to skip unchanged files.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS puzzles ("
+        "date TEXT PRIMARY KEY, source_mtime REAL NOT NULL, json BLOB NOT NULL)"
+    )
+    return conn
+
+
+def save_puzzle(conn: sqlite3.Connection, date_str: str, source_mtime: float, data: bytes) -> None:
+    """Insert or replace one puzzle's JSON in the store."""
+    conn.execute(
+        "INSERT OR REPLACE INTO puzzles (date, source_mtime, json) VALUES (?, ?, ?)",
+        (date_str, source_mtime, data),
+    )
+
+
+def parse_worker(filepath: str) -> tuple[dict | None, str | None]:
+    """Pool worker: parse one file, returning (result, error message)."""
+    try:
+        return parse_file(filepath), None
+    except Exception as e:
+        return None, str(e)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Parse xwordinfo HTML files into puzzle JSON")
     parser.add_argument("--date", help="Parse a single date (YYYY-MM-DD)")
-    parser.add_argument("--stdout", action="store_true", help="Print parsed JSON to stdout instead of writing files")
+    parser.add_argument("--stdout", action="store_true", help="Print parsed JSON to stdout instead of storing it")
+    parser.add_argument("--force", action="store_true", help="Re-parse every file, even if its stored puzzle is up to date")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of parser processes (default: CPU count)")
     args = parser.parse_args()
 
     # Single-date mode
     if args.date:
-        filepath = os.path.join(DATA_DIR, f"{args.date}.html")
+        filepath = os.path.join(DATA_DIR, f"{args.date}.html.gz")
+        if not os.path.exists(filepath):
+            filepath = os.path.join(DATA_DIR, f"{args.date}.html")
         if not os.path.exists(filepath):
             print(f"File not found: {filepath}", file=sys.stderr)
             sys.exit(1)
@@ -231,20 +298,19 @@ def main():
             print(f"Could not extract puzzle data from {filepath}", file=sys.stderr)
             sys.exit(1)
         if args.stdout:
-            json.dump(result, sys.stdout, ensure_ascii=False)
+            sys.stdout.buffer.write(orjson.dumps(result))
         else:
-            os.makedirs(PUZZLES_DIR, exist_ok=True)
-            out_path = os.path.join(PUZZLES_DIR, f"{args.date}.json")
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-            print(f"Wrote {out_path}")
+            conn = open_puzzle_db()
+            with conn:
+                save_puzzle(conn, args.date, os.path.getmtime(filepath), orjson.dumps(result))
+            conn.close()
+            print(f"Wrote {args.date} to {PUZZLES_DB}")
         return
 
     # Bulk mode (existing behavior)
-    os.makedirs(PUZZLES_DIR, exist_ok=True)
     base_dir = os.path.dirname(os.path.abspath(__file__))
 
-    html_files = sorted(glob(os.path.join(DATA_DIR, "*.html")))
+    html_files = find_html_files()
     if not html_files:
         print(f"No HTML files found in {DATA_DIR}/")
         print("Run download.py first to fetch crossword pages.")
@@ -253,42 +319,78 @@ def main():
     print(f"Found {len(html_files)} HTML files to parse\n")
 
     success = 0
+    cached = 0
     failed = 0
-    all_puzzles = {}
 
-    for filepath in html_files:
-        basename = os.path.basename(filepath)
-        date_str = basename.replace(".html", "")
-        print(f"  [{date_str}] Parsing ... ", end="", flush=True)
+    # An HTML file whose mtime matches the one recorded when it was last
+    # parsed is unchanged, and its stored JSON is reused as-is
+    conn = open_puzzle_db()
+    stored_mtimes = {}
+    if not args.force:
+        stored_mtimes = dict(conn.execute("SELECT date, source_mtime FROM puzzles"))
+
+    source_mtimes = {filepath: os.path.getmtime(filepath) for filepath in html_files}
+    fresh = {
+        filepath for filepath in html_files
+        if stored_mtimes.get(date_of(filepath)) == source_mtimes[filepath]
+    }
 
-        try:
-            result = parse_file(filepath)
-            if result:
-                out_path = os.path.join(PUZZLES_DIR, f"{date_str}.json")
-                with open(out_path, "w", encoding="utf-8") as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
+    # Stream puzzles.js for the webapp (works with file:// protocol) one entry
+    # at a time, so memory stays flat no matter how many puzzles there are.
+    # It goes to a temp file that only replaces puzzles.js once complete, so
+    # an interrupted run leaves the previous puzzles.js intact.
+    js_path = os.path.join(base_dir, "puzzles.js")
+    tmp_path = js_path + ".tmp"
+    # Rows are committed every COMMIT_EVERY puzzles, so an interrupted run
+    # keeps most of what it parsed for the next incremental run
+    with open(tmp_path, "wb", buffering=WRITE_BUFFER) as js, ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        js.write("// Auto-generated by parse.py — all puzzle data for the webapp\n".encode("utf-8"))
+        js.write(b"const ALL_PUZZLES = {")
+
+        # Parse stale files across processes; map() yields in submission
+        # order, so puzzles.js stays sorted by date
+        parsed = pool.map(parse_worker, [fp for fp in html_files if fp not in fresh], chunksize=8)
+
+        for filepath in html_files:
+            date_str = date_of(filepath)
+
+            if filepath in fresh:
+                (data,) = conn.execute("SELECT json FROM puzzles WHERE date = ?", (date_str,)).fetchone()
+                if success or cached:
+                    js.write(b",")
+                js.write(orjson.dumps(date_str) + b":" + data)
+                cached += 1
+                continue
+
+            result, error = next(parsed)
+            print(f"  [{date_str}] Parsing ... ", end="")
+
+            if error:
+                print(f"FAILED: {error}")
+                failed += 1
+            elif result:
+                data = orjson.dumps(result)
+                save_puzzle(conn, date_str, source_mtimes[filepath], data)
+                if (success + 1) % COMMIT_EVERY == 0:
+                    conn.commit()
                 n_across = len(result["clues"]["across"])
                 n_down = len(result["clues"]["down"])
                 print(f"OK ({n_across}A + {n_down}D clues, {result['dimensions']['rows']}x{result['dimensions']['cols']})")
-                all_puzzles[date_str] = result
+                if success or cached:
+                    js.write(b",")
+                js.write(orjson.dumps(date_str) + b":" + data)
                 success += 1
             else:
                 print("FAILED: could not extract puzzle data")
                 failed += 1
-        except Exception as e:
-            print(f"FAILED: {e}")
-            failed += 1
 
-    # Write puzzles.js for the webapp (works with file:// protocol)
-    js_path = os.path.join(base_dir, "puzzles.js")
-    with open(js_path, "w", encoding="utf-8") as f:
-        f.write("// Auto-generated by parse.py — all puzzle data for the webapp\n")
-        f.write("const ALL_PUZZLES = ")
-        json.dump(all_puzzles, f, ensure_ascii=False)
-        f.write(";\n")
-    print(f"\nWrote {js_path} ({len(all_puzzles)} puzzles)")
-
-    print(f"Done: {success} parsed, {failed} failed")
+        js.write(b"};\n")
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, js_path)
+    print(f"\nWrote {js_path} ({success + cached} puzzles)")
+
+    print(f"Done: {success} parsed, {cached} unchanged, {failed} failed")
 
 
 if __name__ == "__main__":
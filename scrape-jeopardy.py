@@ -5,23 +5,27 @@ J-Archive Scraper — scrapes 1000 recent games by game_id range.
 Uses get_text(separator=' ') to preserve spaces between inline HTML elements.
 
 Usage:
-    pip install requests beautifulsoup4
+    pip install 'httpx[http2]' beautifulsoup4 lxml orjson
     python scrape-jeopardy.py              # full scrape (game_ids 8383-9382)
     python scrape-jeopardy.py --test       # test with 3 games only
 """
 
-import requests
+import asyncio
+import httpx
+import orjson
 from bs4 import BeautifulSoup
-import json
 import time
 import re
 import os
 import sys
+from collections import deque
 from datetime import datetime
 
 BASE_URL = "https://j-archive.com"
 OUTPUT_FILE = "jeopardy-scraped.json"
-PROGRESS_FILE = "jeopardy-scrape-progress.json"
+PROGRESS_FILE = "jeopardy-scrape-progress.jsonl"
+LEGACY_PROGRESS_FILE = "jeopardy-scrape-progress.json"
+WRITE_BUFFER = 64 * 1024
 
 # Game ID range: latest 1000 games
 START_ID = 8383
@@ -30,6 +34,67 @@ END_ID = 9382
 # Test game IDs
 TEST_IDS = [9382, 7424, 8500]
 
+# Show number and air date from the page title
+TITLE_RE = re.compile(r'Show #(\d+).*aired (\d{4}-\d{2}-\d{2})')
+
+# In-flight requests for the full scrape, capped by a global request rate
+MAX_IN_FLIGHT = 5
+MAX_REQUESTS_PER_SEC = 2
+
+# Transient failures are retried with exponential backoff (0.5s, 1s, 2s)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Sliding-window limiter shared by the scraper tasks."""
+
+    def __init__(self, max_calls, period=1.0):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+
+    async def wait(self):
+        """Sleep until another request fits inside the window."""
+        while True:
+            now = time.monotonic()
+            while self.calls and now - self.calls[0] >= self.period:
+                self.calls.popleft()
+            if len(self.calls) < self.max_calls:
+                self.calls.append(now)
+                return
+            await asyncio.sleep(self.period - (now - self.calls[0]))
+
+
+RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_SEC)
+
+
+def make_client():
+    """One HTTP/2 client for the whole run: every request goes to the same host."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=MAX_IN_FLIGHT),
+    )
+
+
+async def fetch(client, url):
+    """GET a page through the rate limiter, retrying transient failures."""
+    for attempt in range(MAX_RETRIES + 1):
+        await RATE_LIMITER.wait()
+        try:
+            response = await client.get(url)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response.text
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
 
 def clean_html_text(element):
     """
@@ -43,13 +108,66 @@ def clean_html_text(element):
     return ' '.join(text.split()).strip()
 
 
-def scrape_game(game_id):
+def parse_round(by_id, dd_ids, round_id, prefix, value_step):
+    """Extract categories and clues for one 6x5 board round."""
+    categories = []
+    clues = []
+
+    round_el = by_id.get(round_id)
+    if not round_el:
+        return {'categories': categories, 'clues': clues}
+
+    for cat in round_el.find_all('td', class_='category_name'):
+        categories.append(clean_html_text(cat))
+
+    for col in range(1, 7):
+        for row in range(1, 6):
+            clue_id = f'clue_{prefix}_{col}_{row}'
+            clue_el = by_id.get(clue_id)
+            if not clue_el or not clue_el.get_text(strip=True):
+                continue
+
+            answer = ''
+            ans_el = by_id.get(f'{clue_id}_r')
+            if ans_el:
+                correct = ans_el.find('em', class_='correct_response')
+                if correct:
+                    answer = clean_html_text(correct)
+
+            clue_data = {
+                'cat': col - 1,
+                'row': row,
+                'value': row * value_step,
+                'clue': clean_html_text(clue_el),
+                'answer': answer
+            }
+            if clue_id in dd_ids:
+                clue_data['dailyDouble'] = True
+
+            clues.append(clue_data)
+
+    return {'categories': categories, 'clues': clues}
+
+
+async def scrape_game(client, game_id):
     """Scrape a single game from j-archive."""
     url = f"{BASE_URL}/showgame.php?game_id={game_id}"
 
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
+    html = await fetch(client, url)
+    soup = BeautifulSoup(html, 'lxml')
+
+    # Index every element with an id once; the clue lookups below hit it ~120 times
+    by_id = {}
+    for el in soup.find_all(id=True):
+        by_id.setdefault(el['id'], el)
+
+    # Ids inside each Daily Double's clue cell, found once per page (there are
+    # only ~3) instead of walking up from every clue to check
+    dd_ids = set()
+    for dd in soup.find_all(class_='clue_value_daily_double'):
+        clue_container = dd.find_parent('td', class_='clue')
+        if clue_container:
+            dd_ids.update(el['id'] for el in clue_container.find_all(id=True))
 
     game = {
         'gameId': str(game_id),
@@ -62,93 +180,27 @@ def scrape_game(game_id):
 
     # Extract show number and air date from title
     title = soup.title.string if soup.title else ''
-    match = re.search(r'Show #(\d+).*aired (\d{4}-\d{2}-\d{2})', title)
+    match = TITLE_RE.search(title)
     if match:
         game['showNumber'] = match.group(1)
         game['airDate'] = match.group(2)
 
-    # Jeopardy Round
-    j_round = soup.find(id='jeopardy_round')
-    if j_round:
-        for cat in j_round.find_all('td', class_='category_name'):
-            game['jRound']['categories'].append(clean_html_text(cat))
-
-        for col in range(1, 7):
-            for row in range(1, 6):
-                clue_el = soup.find(id=f'clue_J_{col}_{row}')
-                ans_el = soup.find(id=f'clue_J_{col}_{row}_r')
-
-                if clue_el and clue_el.get_text(strip=True):
-                    answer = ''
-                    if ans_el:
-                        correct = ans_el.find('em', class_='correct_response')
-                        if correct:
-                            answer = clean_html_text(correct)
-
-                    is_dd = False
-                    clue_container = clue_el.find_parent('td', class_='clue')
-                    if clue_container and clue_container.find(class_='clue_value_daily_double'):
-                        is_dd = True
-
-                    clue_data = {
-                        'cat': col - 1,
-                        'row': row,
-                        'value': row * 200,
-                        'clue': clean_html_text(clue_el),
-                        'answer': answer
-                    }
-                    if is_dd:
-                        clue_data['dailyDouble'] = True
-
-                    game['jRound']['clues'].append(clue_data)
-
-    # Double Jeopardy Round
-    dj_round = soup.find(id='double_jeopardy_round')
-    if dj_round:
-        for cat in dj_round.find_all('td', class_='category_name'):
-            game['djRound']['categories'].append(clean_html_text(cat))
-
-        for col in range(1, 7):
-            for row in range(1, 6):
-                clue_el = soup.find(id=f'clue_DJ_{col}_{row}')
-                ans_el = soup.find(id=f'clue_DJ_{col}_{row}_r')
-
-                if clue_el and clue_el.get_text(strip=True):
-                    answer = ''
-                    if ans_el:
-                        correct = ans_el.find('em', class_='correct_response')
-                        if correct:
-                            answer = clean_html_text(correct)
-
-                    is_dd = False
-                    clue_container = clue_el.find_parent('td', class_='clue')
-                    if clue_container and clue_container.find(class_='clue_value_daily_double'):
-                        is_dd = True
-
-                    clue_data = {
-                        'cat': col - 1,
-                        'row': row,
-                        'value': row * 400,
-                        'clue': clean_html_text(clue_el),
-                        'answer': answer
-                    }
-                    if is_dd:
-                        clue_data['dailyDouble'] = True
-
-                    game['djRound']['clues'].append(clue_data)
+    # Jeopardy and Double Jeopardy share a layout; only the prefix and values differ
+    game['jRound'] = parse_round(by_id, dd_ids, 'jeopardy_round', 'J', 200)
+    game['djRound'] = parse_round(by_id, dd_ids, 'double_jeopardy_round', 'DJ', 400)
 
     # Final Jeopardy
-    fj_round = soup.find(id='final_jeopardy_round')
+    fj_round = by_id.get('final_jeopardy_round')
     if fj_round:
         fj_cat = fj_round.find('td', class_='category_name')
         if fj_cat:
             game['fj']['category'] = clean_html_text(fj_cat)
 
-        fj_clue = soup.find(id='clue_FJ')
+        fj_clue = by_id.get('clue_FJ')
         if fj_clue:
             game['fj']['clue'] = clean_html_text(fj_clue)
 
-        fj_ans = soup.find(id='clue_FJ_r')
+        fj_ans = by_id.get('clue_FJ_r')
         if fj_ans:
             correct = fj_ans.find('em', class_='correct_response')
             if correct:
@@ -165,116 +217,142 @@ def count_clues(game):
     return count
 
 
+def import_legacy_progress():
+    """Convert a pre-JSON-Lines {'completed_ids', 'games'} checkpoint into the log."""
+    with open(LEGACY_PROGRESS_FILE, 'rb') as f:
+        legacy = orjson.loads(f.read())
+    games_by_id = {int(g['gameId']): g for g in legacy.get('games', [])}
+    game_ids = sorted(set(legacy.get('completed_ids', [])) | set(games_by_id))
+
+    # Write to a temp file first so an interrupted import is simply redone
+    tmp_path = PROGRESS_FILE + '.tmp'
+    with open(tmp_path, 'wb', buffering=WRITE_BUFFER) as f:
+        for gid in game_ids:
+            f.write(orjson.dumps({'id': gid, 'game': games_by_id.get(gid)}) + b'\n')
+    os.replace(tmp_path, PROGRESS_FILE)
+    print(f"Imported {len(game_ids)} completed ids from {LEGACY_PROGRESS_FILE}")
+
+
 def load_progress():
-    """Load scrape progress for resume capability."""
+    """Replay the progress log for resume capability. Returns (completed_ids, games)."""
+    completed = set()
+    games = []
+    if not os.path.exists(PROGRESS_FILE) and os.path.exists(LEGACY_PROGRESS_FILE):
+        import_legacy_progress()
     if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE, 'r') as f:
-            return json.load(f)
-    return {'completed_ids': [], 'games': []}
+        with open(PROGRESS_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # blank or truncated line from an interrupted run
+                completed.add(entry['id'])
+                if entry['game']:
+                    games.append(entry['game'])
+    return completed, games
 
 
-def save_progress(progress):
-    """Save scrape progress."""
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress, f)
+def save_progress(f, game_id, game):
+    """Append one finished game id to the progress log (game is None if skipped)."""
+    f.write(orjson.dumps({'id': game_id, 'game': game}) + b'\n')
+    f.flush()
 
 
-def run_test():
+async def run_test():
     """Test scrape with 3 specific games."""
     print("=" * 60)
     print("TEST MODE — scraping 3 games")
     print("=" * 60)
 
-    for gid in TEST_IDS:
-        print(f"\nScraping game {gid}...", end=' ', flush=True)
-        try:
-            game = scrape_game(gid)
-            clues = count_clues(game)
-            print(f"OK (Show #{game['showNumber']}, {game['airDate']}, {clues} clues)")
-
-            # For game 7424, check specific clues for spacing
-            if gid == 7424:
-                print("\n  Checking game 7424 for spacing issues...")
-                j_clues = game['jRound']['clues']
-                for c in j_clues:
-                    if c['cat'] == 0 and c['row'] == 1:
-                        print(f"    [0,1] clue: {c['clue'][:80]}")
-                        print(f"    [0,1] answer: {c['answer']}")
-                    if c['cat'] == 4 and c['row'] == 1:
-                        print(f"    [4,1] clue: {c['clue'][:80]}")
-                        print(f"    [4,1] answer: {c['answer']}")
-
-            # Print a sample clue
-            if game['jRound']['clues']:
-                sample = game['jRound']['clues'][0]
-                print(f"  Sample J clue: {sample['clue'][:80]}")
-                print(f"  Sample J answer: {sample['answer']}")
-            if game['fj']['clue']:
-                print(f"  FJ category: {game['fj']['category']}")
-                print(f"  FJ clue: {game['fj']['clue'][:80]}")
-                print(f"  FJ answer: {game['fj']['answer']}")
-
-        except Exception as e:
-            print(f"ERROR: {e}")
-
-        time.sleep(0.5)
+    async with make_client() as client:
+        for gid in TEST_IDS:
+            print(f"\nScraping game {gid}...", end=' ', flush=True)
+            try:
+                game = await scrape_game(client, gid)
+                clues = count_clues(game)
+                print(f"OK (Show #{game['showNumber']}, {game['airDate']}, {clues} clues)")
+
+                # For game 7424, check specific clues for spacing
+                if gid == 7424:
+                    print("\n  Checking game 7424 for spacing issues...")
+                    j_clues = game['jRound']['clues']
+                    for c in j_clues:
+                        if c['cat'] == 0 and c['row'] == 1:
+                            print(f"    [0,1] clue: {c['clue'][:80]}")
+                            print(f"    [0,1] answer: {c['answer']}")
+                        if c['cat'] == 4 and c['row'] == 1:
+                            print(f"    [4,1] clue: {c['clue'][:80]}")
+                            print(f"    [4,1] answer: {c['answer']}")
+
+                # Print a sample clue
+                if game['jRound']['clues']:
+                    sample = game['jRound']['clues'][0]
+                    print(f"  Sample J clue: {sample['clue'][:80]}")
+                    print(f"  Sample J answer: {sample['answer']}")
+                if game['fj']['clue']:
+                    print(f"  FJ category: {game['fj']['category']}")
+                    print(f"  FJ clue: {game['fj']['clue'][:80]}")
+                    print(f"  FJ answer: {game['fj']['answer']}")
+
+            except Exception as e:
+                print(f"ERROR: {e}")
+
+            await asyncio.sleep(0.5)
 
     print("\nTest complete!")
 
 
-def run_full_scrape():
+async def run_full_scrape():
     """Scrape all 1000 games."""
     print("=" * 60)
     print(f"FULL SCRAPE — game_ids {START_ID} to {END_ID}")
     print("=" * 60)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    progress = load_progress()
-    completed = set(progress['completed_ids'])
-    games = progress['games']
+    completed, games = load_progress()
 
     all_ids = list(range(START_ID, END_ID + 1))
     remaining = [gid for gid in all_ids if gid not in completed]
 
     print(f"Already scraped: {len(completed)}, remaining: {len(remaining)}")
 
+    already_done = len(completed)
     failed = []
-    for i, gid in enumerate(remaining):
-        print(f"  [{len(completed) + i + 1}/{len(all_ids)}] Game {gid}...", end=' ', flush=True)
-        try:
-            game = scrape_game(gid)
-            if len(game['jRound']['clues']) > 0:
-                games.append(game)
-                completed.add(gid)
-                clues = count_clues(game)
-                print(f"OK (Show #{game['showNumber']}, {clues} clues)")
-            else:
-                print("SKIPPED (no clues)")
-                completed.add(gid)  # mark as done so we don't retry
-
-            # Save progress every 25 games
-            if (i + 1) % 25 == 0:
-                progress['completed_ids'] = list(completed)
-                progress['games'] = games
-                save_progress(progress)
-                print(f"  [progress saved: {len(games)} games]")
-
-        except Exception as e:
-            print(f"ERROR: {e}")
-            failed.append(gid)
-            time.sleep(1)
-
-        time.sleep(0.5)
-
-    # Save final output
-    progress['completed_ids'] = list(completed)
-    progress['games'] = games
-    save_progress(progress)
+    gate = asyncio.Semaphore(MAX_IN_FLIGHT)
+
+    async def scrape_one(client, gid):
+        async with gate:
+            try:
+                return gid, await scrape_game(client, gid), None
+            except Exception as e:
+                return gid, None, e
+
+    with open(PROGRESS_FILE, 'ab') as progress_file:
+        async with make_client() as client:
+            tasks = [scrape_one(client, gid) for gid in remaining]
+            for i, next_done in enumerate(asyncio.as_completed(tasks)):
+                gid, game, error = await next_done
+                print(f"  [{already_done + i + 1}/{len(all_ids)}] Game {gid}...", end=' ', flush=True)
+                if error is not None:
+                    print(f"ERROR: {error}")
+                    failed.append(gid)
+                    continue
+
+                if len(game['jRound']['clues']) > 0:
+                    games.append(game)
+                    completed.add(gid)
+                    save_progress(progress_file, gid, game)
+                    clues = count_clues(game)
+                    print(f"OK (Show #{game['showNumber']}, {clues} clues)")
+                else:
+                    print("SKIPPED (no clues)")
+                    completed.add(gid)  # mark as done so we don't retry
+                    save_progress(progress_file, gid, None)
 
     # Sort by air date and write final output
     games.sort(key=lambda g: g.get('airDate', ''))
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(games, f, indent=2, ensure_ascii=False)
+    with open(OUTPUT_FILE, 'wb', buffering=WRITE_BUFFER) as f:
+        f.write(orjson.dumps(games, option=orjson.OPT_INDENT_2))
 
     total_clues = sum(count_clues(g) for g in games)
     print(f"\n{'=' * 60}")
@@ -289,6 +367,6 @@ def run_full_scrape():
 
 if __name__ == '__main__':
     if '--test' in sys.argv:
-        run_test()
+        asyncio.run(run_test())
     else:
-        run_full_scrape()
+        asyncio.run(run_full_scrape())